@@ -16,7 +16,7 @@ Key responsibilities:
 
 Dependencies:
     - sqlite3 connection passed in from calling code
-    - json for storing lists and full summary objects
+    - orjson for storing lists and full summary objects
 
 Notes:
     We intentionally do NOT expire snapshots (static snapshots) due to the
@@ -24,11 +24,23 @@ Notes:
 """
 
 from __future__ import annotations
-import json
 import sqlite3
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+import orjson
+
+
+def _dumps(obj: Any) -> str:
+    """
+    Serialize to JSON text for TEXT columns.
+
+    Notes:
+        orjson emits UTF-8 (non-ASCII kept as-is, like ensure_ascii=False)
+        and is considerably faster than stdlib json on summary dicts.
+    """
+    return orjson.dumps(obj).decode()
+
 
 def utc_now_iso() -> str:
     """Return current UTC timestamp in ISO-8601 format."""
@@ -41,63 +53,135 @@ def normalize_city(city: str) -> str:
 
     Notes:
         This must match how you store and query city snapshots.
+        Callers normalize once and pass the resulting key through to the
+        snapshot helpers (and selenium_peak_hours.get_attraction_names).
     """
     return city.strip().lower()
 
 
+# -----------------------------
+# SQL statements
+# -----------------------------
+# Kept at module level so every call passes the identical SQL text and the
+# connection's prepared-statement cache (see db.connect) hits reliably.
+# The UPSERTs skip the UPDATE when the stored JSON is unchanged, so re-saving
+# identical data dirties no pages (and keeps the original timestamp).
+
+_SQL_GET_CITY_SNAPSHOT = (
+    "SELECT item_ids_json FROM city_top10 "
+    "WHERE city_key=? AND source=? AND item_type=? LIMIT 1"
+)
+
+_SQL_UPSERT_CITY_SNAPSHOT = """
+INSERT INTO city_top10 (city_key, city_display, source, item_type, item_ids_json, created_at_utc)
+VALUES (?, ?, ?, ?, json(?), ?)
+ON CONFLICT(city_key, source, item_type) DO UPDATE SET
+    city_display   = excluded.city_display,
+    item_ids_json  = excluded.item_ids_json,
+    created_at_utc = excluded.created_at_utc
+WHERE city_top10.item_ids_json IS NOT excluded.item_ids_json
+"""
+
+_SQL_GET_ITEM = "SELECT summary_json FROM item_summary WHERE source=? AND item_id=?"
+
+_SQL_GET_ITEMS = (
+    "SELECT item_id, summary_json FROM item_summary "
+    "WHERE source=? AND item_id IN (SELECT value FROM json_each(?))"
+)
+
+_SQL_UPSERT_ITEM = """
+INSERT INTO item_summary (
+    source, item_id, name, address, rating, review_count, category_primary,
+    wheelchair_accessible_entrance, website, phone, lat, lng,
+    summary_json, fetched_at_utc
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(source, item_id) DO UPDATE SET
+    name=excluded.name,
+    address=excluded.address,
+    rating=excluded.rating,
+    review_count=excluded.review_count,
+    category_primary=excluded.category_primary,
+    wheelchair_accessible_entrance=excluded.wheelchair_accessible_entrance,
+    website=excluded.website,
+    phone=excluded.phone,
+    lat=excluded.lat,
+    lng=excluded.lng,
+    summary_json=excluded.summary_json,
+    fetched_at_utc=excluded.fetched_at_utc
+WHERE item_summary.summary_json IS NOT excluded.summary_json
+"""
+
+
 # -----------------------------
 # City snapshot helpers (Top10)
 # -----------------------------
 
 def get_city_snapshot_item_ids(
     conn: sqlite3.Connection,
-    city: str,
+    city_key: str,
     source: str,
     item_type: str
 ) -> Optional[List[str]]:
     """
     Load a stored Top-10 snapshot for a given city/source/type.
 
+    Parameters
+    ----------
+    city_key : str
+        Already-normalized city key (see normalize_city()).
+
     Returns
     -------
     list[str] or None
         The saved item IDs if snapshot exists, otherwise None.
+
+    Notes:
+        The WHERE clause matches the full (city_key, source, item_type)
+        primary key, so SQLite resolves it with a single search on the PK
+        index; LIMIT 1 lets it stop right after that row.
     """
-    city_key = normalize_city(city)
-    row = conn.execute(
-        "SELECT item_ids_json FROM city_top10 WHERE city_key=? AND source=? AND item_type=?",
-        (city_key, source, item_type),
-    ).fetchone()
+    row = conn.execute(_SQL_GET_CITY_SNAPSHOT, (city_key, source, item_type)).fetchone()
 
-    return json.loads(row[0]) if row else None
+    return orjson.loads(row[0]) if row else None
 
 
 def save_city_snapshot_item_ids(
     conn: sqlite3.Connection,
-    city: str,
+    city_key: str,
+    city_display: str,
     source: str,
     item_type: str,
     item_ids: List[str],
+    commit: bool = False,
+    now: Optional[str] = None,
 ) -> None:
     """
     Save (UPSERT) a Top-10 snapshot.
 
+    Parameters
+    ----------
+    city_key : str
+        Already-normalized city key (see normalize_city()).
+
+    city_display : str
+        City name as entered by the user (stored for display only).
+
     Notes:
         This is the "static snapshot" step: once saved, future runs reuse it.
+        The write joins the caller's transaction; pass commit=True (or wrap
+        the call in `with conn:`) to make it durable.
+        The IDs are bound as one JSON text and passed through SQLite's json(),
+        so the stored array has the canonical JSON1 form (what json_each sees),
+        the SQL text stays constant, and there is no cap on the list size.
+        `now` overrides created_at_utc (default: utc_now_iso()) so a batch
+        can share one timestamp.
     """
-    city_key = normalize_city(city)
     conn.execute(
-        """
-        INSERT INTO city_top10 (city_key, city_display, source, item_type, item_ids_json, created_at_utc)
-        VALUES (?, ?, ?, ?, ?, ?)
-        ON CONFLICT(city_key, source, item_type) DO UPDATE SET
-            city_display   = excluded.city_display,
-            item_ids_json  = excluded.item_ids_json,
-            created_at_utc = excluded.created_at_utc
-        """,
-        (city_key, city.strip(), source, item_type, json.dumps(item_ids), utc_now_iso()),
+        _SQL_UPSERT_CITY_SNAPSHOT,
+        (city_key, city_display, source, item_type, _dumps(item_ids), now or utc_now_iso()),
     )
-    conn.commit()
+    if commit:
+        conn.commit()
 
 
 # -----------------------------
@@ -117,17 +201,79 @@ def get_cached_item_summary(
     dict or None
         Parsed JSON summary if present, else None.
     """
-    row = conn.execute(
-        "SELECT summary_json FROM item_summary WHERE source=? AND item_id=?",
-        (source, item_id),
-    ).fetchone()
+    row = conn.execute(_SQL_GET_ITEM, (source, item_id)).fetchone()
+
+    return orjson.loads(row[0]) if row else None
+
+
+def get_cached_item_summaries(
+    conn: sqlite3.Connection,
+    source: str,
+    item_ids: List[str],
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Batch version of get_cached_item_summary(): one SELECT for many IDs.
+
+    Returns
+    -------
+    dict[str, dict]
+        Parsed summaries keyed by item_id; IDs not in the cache are absent.
+
+    Notes:
+        The ID list is bound as one JSON array and expanded with json_each(),
+        so the SQL text stays constant regardless of how many IDs are passed.
+    """
+    if not item_ids:
+        return {}
+
+    rows = conn.execute(_SQL_GET_ITEMS, (source, _dumps(item_ids))).fetchall()
 
-    return json.loads(row[0]) if row else None
+    return {item_id: orjson.loads(summary_json) for item_id, summary_json in rows}
+
+
+def _item_summary_row(summary: Dict[str, Any], now: str) -> tuple:
+    """
+    Build the parameter tuple for _SQL_UPSERT_ITEM from one summary dict.
+
+    `now` is stored as fetched_at_utc.
+
+    Raises
+    ------
+    ValueError
+        If the summary lacks 'source' or 'item_id'.
+    """
+    source = summary.get("source")
+    item_id = summary.get("item_id")
+    if not source or not item_id:
+        raise ValueError("summary must include 'source' and 'item_id'")
+
+    # Convert booleans to SQLite-friendly integers
+    w = summary.get("wheelchair_accessible_entrance")
+    w_int = 1 if w is True else 0 if w is False else None
+
+    return (
+        source,
+        item_id,
+        summary.get("name"),
+        summary.get("address"),
+        summary.get("rating"),
+        summary.get("review_count"),
+        summary.get("category_primary"),
+        w_int,
+        summary.get("website"),
+        summary.get("phone"),
+        summary.get("lat"),
+        summary.get("lng"),
+        _dumps(summary),
+        now,
+    )
 
 
 def upsert_item_summary(
     conn: sqlite3.Connection,
     summary: Dict[str, Any],
+    commit: bool = False,
+    now: Optional[str] = None,
 ) -> None:
     """
     Insert/update an item summary in the cache.
@@ -140,63 +286,34 @@ def upsert_item_summary(
         We store both:
         - normalized columns (name, rating, lat/lng...)
         - full summary_json (the whole dict) for flexibility
-    """
-    source = summary.get("source")
-    item_id = summary.get("item_id")
-    if not source or not item_id:
-        raise ValueError("summary must include 'source' and 'item_id'")
+        types_json / opening_hours_json are generated from summary_json
+        by SQLite, so they are not written here.
 
-    # Convert booleans to SQLite-friendly integers
-    w = summary.get("wheelchair_accessible_entrance")
-    w_int = 1 if w is True else 0 if w is False else None
+        Like save_city_snapshot_item_ids(), this does not commit unless
+        commit=True, so pipelines can batch many rows into one transaction,
+        and accepts `now` to reuse one fetched_at_utc timestamp per batch.
+    """
+    conn.execute(_SQL_UPSERT_ITEM, _item_summary_row(summary, now or utc_now_iso()))
+    if commit:
+        conn.commit()
 
-    # Lists stored as JSON strings
-    types = summary.get("types")
-    types_json = json.dumps(types, ensure_ascii=False) if types is not None else None
 
-    hours = summary.get("opening_hours_weekday_descriptions")
-    hours_json = json.dumps(hours, ensure_ascii=False) if hours is not None else None
+def upsert_item_summaries(
+    conn: sqlite3.Connection,
+    summaries: List[Dict[str, Any]],
+    commit: bool = False,
+    now: Optional[str] = None,
+) -> None:
+    """
+    Batch version of upsert_item_summary(): one executemany() for all rows.
 
-    conn.execute(
-        """
-        INSERT INTO item_summary (
-            source, item_id, name, address, rating, review_count, category_primary,
-            types_json, wheelchair_accessible_entrance, opening_hours_json,
-            website, phone, lat, lng, summary_json, fetched_at_utc
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT(source, item_id) DO UPDATE SET
-            name=excluded.name,
-            address=excluded.address,
-            rating=excluded.rating,
-            review_count=excluded.review_count,
-            category_primary=excluded.category_primary,
-            types_json=excluded.types_json,
-            wheelchair_accessible_entrance=excluded.wheelchair_accessible_entrance,
-            opening_hours_json=excluded.opening_hours_json,
-            website=excluded.website,
-            phone=excluded.phone,
-            lat=excluded.lat,
-            lng=excluded.lng,
-            summary_json=excluded.summary_json,
-            fetched_at_utc=excluded.fetched_at_utc
-        """,
-        (
-            source,
-            item_id,
-            summary.get("name"),
-            summary.get("address"),
-            summary.get("rating"),
-            summary.get("review_count"),
-            summary.get("category_primary"),
-            types_json,
-            w_int,
-            hours_json,
-            summary.get("website"),
-            summary.get("phone"),
-            summary.get("lat"),
-            summary.get("lng"),
-            json.dumps(summary, ensure_ascii=False),
-            utc_now_iso(),
-        ),
-    )
-    conn.commit()
\ No newline at end of file
+    Notes:
+        Same required fields and commit behaviour as upsert_item_summary().
+        All rows share one fetched_at_utc timestamp.
+    """
+    if not summaries:
+        return
+    now = now or utc_now_iso()
+    conn.executemany(_SQL_UPSERT_ITEM, [_item_summary_row(s, now) for s in summaries])
+    if commit:
+        conn.commit()
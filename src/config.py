@@ -8,7 +8,7 @@ Role in architecture:
     Configuration layer — used by all modules.
 
 Key responsibilities:
-    - Load API keys and the shared SQLite DB path
+    - Load API keys and the shared SQLite DB path (lazily, on first access)
     - Fail fast with helpful error messages if missing
 
 Dependencies:
@@ -54,6 +54,20 @@ def require_env(name: str) -> str:
 
 
 # --- Required configuration ---
-GOOGLE_API_KEY = require_env("GOOGLE_MAPS_API_KEY")
-TA_API_KEY = require_env("TRIPADVISOR_API_KEY")
-DB_PATH = require_env("DABN23_DB_PATH")
\ No newline at end of file
+# Resolved lazily on first access (PEP 562), so a module only requires the
+# variables it actually imports: e.g. tripadvisor.py works without a Google key.
+_ENV_NAMES = {
+    "GOOGLE_API_KEY": "GOOGLE_MAPS_API_KEY",
+    "TA_API_KEY": "TRIPADVISOR_API_KEY",
+    "DB_PATH": "DABN23_DB_PATH",
+}
+
+
+def __getattr__(name: str) -> str:
+    env_name = _ENV_NAMES.get(name)
+    if env_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = require_env(env_name)
+    globals()[name] = value  # cache: later lookups skip __getattr__
+    return value
@@ -8,7 +8,8 @@ Role in architecture:
     Persistence layer — shared cache for Google Places + TripAdvisor.
 
 Key responsibilities:
-    - Open SQLite connection (WAL mode)
+    - Open SQLite connection (WAL mode + performance PRAGMAs)
+    - Provide an in-memory read copy for read-heavy workers
     - Create tables and indexes (unified schema)
     - Perform minimal one-time migrations from earlier schemas
 
@@ -28,6 +29,44 @@ import sqlite3
 from typing import List
 
 
+# item_summary schema, shared by create_tables() and _migrate_item_summary().
+# types_json / opening_hours_json are VIRTUAL generated columns: they are
+# computed from summary_json on read, so writes only serialize the summary once.
+_ITEM_SUMMARY_DDL = """
+CREATE TABLE IF NOT EXISTS {table} (
+    source         TEXT NOT NULL,   -- 'google' | 'tripadvisor'
+    item_id        TEXT NOT NULL,   -- Google: place_id, TA: location_id
+    name           TEXT,
+    address        TEXT,
+    rating         REAL,
+    review_count   INTEGER,
+    category_primary TEXT,
+
+    -- We keep this generic: Google uses "types", TA uses "groups/tags"
+    types_json     TEXT GENERATED ALWAYS AS (json_extract(summary_json, '$.types')) VIRTUAL,
+
+    -- Google provides these; TripAdvisor typically does not
+    wheelchair_accessible_entrance INTEGER,
+    opening_hours_json TEXT GENERATED ALWAYS AS (
+        json_extract(summary_json, '$.opening_hours_weekday_descriptions')
+    ) VIRTUAL,
+
+    website        TEXT,
+    phone          TEXT,
+
+    -- Coordinates: needed for routing
+    lat            REAL,
+    lng            REAL,
+
+    -- Full compacted summary stored for flexibility
+    summary_json   TEXT NOT NULL,
+    fetched_at_utc TEXT NOT NULL,
+
+    PRIMARY KEY (source, item_id)
+);
+"""
+
+
 def connect(db_path: str) -> sqlite3.Connection:
     """
     Open a SQLite connection and set WAL mode for better concurrent access.
@@ -41,12 +80,61 @@ def connect(db_path: str) -> sqlite3.Connection:
     -------
     sqlite3.Connection
         Active DB connection.
+
+    Notes
+    -----
+    synchronous=NORMAL is safe in WAL mode (no corruption, at worst the last
+    commit is lost on power failure) and avoids an fsync on every commit.
+    The remaining PRAGMAs keep temp data and hot pages in memory and make
+    concurrent writers wait instead of failing with "database is locked".
+    cached_statements is raised from the default (128) so the prepared
+    statements of all helper modules stay cached together.
     """
-    conn = sqlite3.connect(db_path)
+    conn = sqlite3.connect(db_path, cached_statements=256)
     conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+    conn.execute("PRAGMA busy_timeout=5000;")
+    conn.execute("PRAGMA temp_store=MEMORY;")
+    conn.execute("PRAGMA cache_size=-20000;")      # ~20 MB page cache
+    conn.execute("PRAGMA mmap_size=268435456;")    # 256 MB memory-mapped I/O
     return conn
 
 
+def memory_snapshot(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """
+    Copy the database behind `conn` into a new in-memory connection.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Connection to the on-disk database (left open and unchanged).
+
+    Returns
+    -------
+    sqlite3.Connection
+        ":memory:" connection holding a point-in-time copy of all tables.
+
+    Raises
+    ------
+    RuntimeError
+        If `conn` has an open transaction (the backup would wait on its
+        own write lock forever); commit or roll back first.
+
+    Notes
+    -----
+    Intended for read-only consumers such as the peak-hours scraper when it
+    loops over many cities: lookups then never touch the disk or WAL, and
+    the disk connection stays free for writers ("one connection for
+    reading, one for writing"). Writes to the copy are NOT persisted.
+    """
+    if conn.in_transaction:
+        raise RuntimeError("Commit or roll back pending changes before taking a memory snapshot.")
+
+    mem = sqlite3.connect(":memory:", cached_statements=256)
+    conn.backup(mem)
+    return mem
+
+
 def _table_exists(conn: sqlite3.Connection, table: str) -> bool:
     """Return True if a table exists in the database."""
     row = conn.execute(
@@ -65,6 +153,23 @@ def migrate_if_needed(conn: sqlite3.Connection) -> None:
     """
     Migrate legacy schemas to the unified schema.
 
+    What this migration handles:
+    - Old city_top10 schema (see _migrate_city_top10)
+    - item_summary with plain types_json / opening_hours_json columns
+      (see _migrate_item_summary)
+
+    Notes:
+    - Each step is a one-time migration and a no-op once applied.
+    - We intentionally keep it simple for project scope.
+    """
+    _migrate_city_top10(conn)
+    _migrate_item_summary(conn)
+
+
+def _migrate_city_top10(conn: sqlite3.Connection) -> None:
+    """
+    Migrate the legacy city_top10 table to the unified schema.
+
     What this migration handles:
     - Old city_top10 schema:
         city_top10(city_key PK, city_display, place_ids_json, created_at_utc)
@@ -79,10 +184,6 @@ def migrate_if_needed(conn: sqlite3.Connection) -> None:
     - Create city_top10_new with the new schema
     - Copy old rows into it (default source='google', item_type='attraction')
     - Drop old table and rename new table
-
-    Notes:
-    - This is a one-time migration.
-    - We intentionally keep it simple for project scope.
     """
     if not _table_exists(conn, "city_top10"):
         return
@@ -142,6 +243,47 @@ def migrate_if_needed(conn: sqlite3.Connection) -> None:
     conn.commit()
 
 
+def _migrate_item_summary(conn: sqlite3.Connection) -> None:
+    """
+    Rebuild item_summary so types_json / opening_hours_json become generated columns.
+
+    Why:
+    - Both lists are already part of summary_json; storing them again doubled
+      the JSON encoding and write volume per row.
+    - SQLite cannot turn an existing column into a generated one, so the
+      table is rebuilt once.
+
+    Strategy:
+    - PRAGMA table_info hides generated columns, so a visible types_json
+      means the legacy layout
+    - Create item_summary_new with the current schema, copy the stored
+      columns, drop the old table and rename (indexes are recreated by
+      create_tables)
+    """
+    if not _table_exists(conn, "item_summary"):
+        return
+
+    if "types_json" not in _columns(conn, "item_summary"):
+        return
+
+    conn.execute(_ITEM_SUMMARY_DDL.format(table="item_summary_new"))
+
+    stored_cols = """
+        source, item_id, name, address, rating, review_count, category_primary,
+        wheelchair_accessible_entrance, website, phone, lat, lng,
+        summary_json, fetched_at_utc
+    """
+    conn.execute(f"""
+    INSERT OR REPLACE INTO item_summary_new ({stored_cols})
+    SELECT {stored_cols} FROM item_summary;
+    """)
+
+    # Swap tables
+    conn.execute("DROP TABLE item_summary;")
+    conn.execute("ALTER TABLE item_summary_new RENAME TO item_summary;")
+    conn.commit()
+
+
 def create_tables(conn: sqlite3.Connection) -> None:
     """
     Create the unified schema (if not already present).
@@ -158,6 +300,8 @@ def create_tables(conn: sqlite3.Connection) -> None:
     -----
     We store a compact, normalized set of columns for easy display,
     AND a summary_json blob to preserve flexibility and raw-ish detail.
+    types_json / opening_hours_json are generated from summary_json
+    (requires SQLite >= 3.31).
     """
     conn.execute("""
     CREATE TABLE IF NOT EXISTS city_top10 (
@@ -171,40 +315,15 @@ def create_tables(conn: sqlite3.Connection) -> None:
     );
     """)
 
-    conn.execute("""
-    CREATE TABLE IF NOT EXISTS item_summary (
-        source         TEXT NOT NULL,   -- 'google' | 'tripadvisor'
-        item_id        TEXT NOT NULL,   -- Google: place_id, TA: location_id
-        name           TEXT,
-        address        TEXT,
-        rating         REAL,
-        review_count   INTEGER,
-        category_primary TEXT,
-
-        -- We keep this generic: Google uses "types", TA uses "groups/tags"
-        types_json     TEXT,
-
-        -- Google provides these; TripAdvisor typically does not
-        wheelchair_accessible_entrance INTEGER,
-        opening_hours_json TEXT,
-
-        website        TEXT,
-        phone          TEXT,
-
-        -- Coordinates: needed for routing
-        lat            REAL,
-        lng            REAL,
-
-        -- Full compacted summary stored for flexibility
-        summary_json   TEXT NOT NULL,
-        fetched_at_utc TEXT NOT NULL,
-
-        PRIMARY KEY (source, item_id)
-    );
-    """)
+    conn.execute(_ITEM_SUMMARY_DDL.format(table="item_summary"))
 
     # Helpful indexes for sorting/searching
     conn.execute("CREATE INDEX IF NOT EXISTS idx_item_review_count ON item_summary(source, review_count);")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_item_name ON item_summary(source, name);")
 
+    # Earlier builds created a covering (source, item_id, name) index. Without
+    # ANALYZE statistics the planner always prefers the primary key for
+    # lookups by id, so it only slowed down writes; drop it from old files.
+    conn.execute("DROP INDEX IF EXISTS idx_item_name_cover;")
+
     conn.commit()
\ No newline at end of file
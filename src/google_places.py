@@ -9,25 +9,105 @@ Role in architecture:
 
 Key responsibilities:
     - Text search for candidate places
-    - Fetch detailed place metadata
+    - Fetch detailed place metadata (one place, or many concurrently),
+      cached in-process and on disk (30-day TTL)
     - Normalize into a unified dict used by item_summary cache
 
 Dependencies:
     - requests
+    - orjson (response decoding from raw bytes)
     - GOOGLE_API_KEY from config.py
 
 Notes:
     We request only the fields we need using FieldMask to reduce payload size.
+    All calls share one keep-alive requests.Session, so TCP/TLS setup is paid
+    once per connection instead of once per request.
+    Concurrency is thread-based (place_details_many) rather than asyncio:
+    the project runs inside Jupyter, where an event loop is already running
+    and asyncio.run() cannot be used, and a pool of warm keep-alive
+    connections already overlaps the round trips of one city's ~10 details.
 """
 
 from __future__ import annotations
+import os
+import shelve
+import tempfile
+import threading
+import time
+from types import MappingProxyType
+import orjson
 import requests
-from typing import Any, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Any, Dict, List, Optional
 from .config import GOOGLE_API_KEY
 
 PLACES_TEXT_SEARCH_URL = "https://places.googleapis.com/v1/places:searchText"
 PLACES_DETAILS_URL_TMPL = "https://places.googleapis.com/v1/places/{place_id}"
 
+# Request headers are fixed per endpoint: built once at import, not per call.
+# (requests merges them into each request; the dicts themselves are never mutated.)
+_SEARCH_FIELDMASK = ",".join([
+    "places.id",
+    "places.displayName",
+    "places.formattedAddress",
+    "places.rating",
+    "places.userRatingCount",
+    "places.primaryType",
+    "places.types",
+])
+
+_DETAILS_FIELDMASK = ",".join([
+    "id",
+    "displayName",
+    "formattedAddress",
+    "rating",
+    "userRatingCount",
+    "primaryType",
+    "types",
+    "accessibilityOptions",
+    "regularOpeningHours",
+    "websiteUri",
+    "nationalPhoneNumber",
+    "location",
+])
+
+_SEARCH_HEADERS = {
+    "Content-Type": "application/json",
+    "X-Goog-Api-Key": GOOGLE_API_KEY,
+    "X-Goog-FieldMask": _SEARCH_FIELDMASK,
+}
+
+_DETAILS_HEADERS = {
+    "X-Goog-Api-Key": GOOGLE_API_KEY,
+    "X-Goog-FieldMask": _DETAILS_FIELDMASK,
+}
+
+# Shared keep-alive session (pool comfortably above place_details_many's workers).
+# Transient failures (429 / 5xx) are retried by urllib3 with short exponential
+# backoff, honoring Retry-After. POST is included because searchText is a
+# read-only query. raise_on_status=False hands the last response back so
+# raise_for_status() still reports the real HTTP error.
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.2,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=frozenset({"GET", "POST"}),
+    raise_on_status=False,
+)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=_RETRY))
+
+# On-disk details cache: "<place_id>:<language_code>" -> (stored_at epoch, details).
+# Place details barely change within a trip-planning session, so repeated
+# notebook runs reuse them for DETAILS_DISK_TTL_S instead of re-fetching.
+# shelve is not thread-safe; place_details_many() calls in from threads.
+DETAILS_DISK_TTL_S = 30 * 24 * 3600
+_DETAILS_DISK_PATH = os.path.join(tempfile.gettempdir(), "dabn23_places_details")
+_DETAILS_DISK_LOCK = threading.Lock()
+
 
 def text_search_many(query: str, language_code: str = "en", max_results: int = 20) -> List[Dict[str, Any]]:
     """
@@ -49,54 +129,103 @@ def text_search_many(query: str, language_code: str = "en", max_results: int = 2
     list[dict]
         List of candidate place objects.
     """
-    headers = {
-        "Content-Type": "application/json",
-        "X-Goog-Api-Key": GOOGLE_API_KEY,
-        "X-Goog-FieldMask": ",".join([
-            "places.id",
-            "places.displayName",
-            "places.formattedAddress",
-            "places.rating",
-            "places.userRatingCount",
-            "places.primaryType",
-            "places.types",
-        ]),
-    }
-
     payload = {"textQuery": query, "languageCode": language_code, "maxResultCount": max_results}
-    r = requests.post(PLACES_TEXT_SEARCH_URL, json=payload, headers=headers, timeout=30)
+    r = _SESSION.post(PLACES_TEXT_SEARCH_URL, json=payload, headers=_SEARCH_HEADERS, timeout=30)
     r.raise_for_status()
-    return r.json().get("places", [])
+    return orjson.loads(r.content).get("places", [])
 
 
-def place_details(place_id: str, language_code: str = "en") -> Dict[str, Any]:
+def place_details(place_id: str, language_code: str = "en") -> Optional[Dict[str, Any]]:
     """
     Google Places Details: fetch richer fields for one place_id.
 
+    Returns None if the place no longer exists (HTTP 404); any other HTTP
+    error (auth, quota, exhausted 5xx retries) raises requests.HTTPError.
+
     Notes:
         We request 'location' so we can store lat/lng for routing.
+        Results are cached per (place_id, language_code): in-process for the
+        lifetime of the process and on disk for DETAILS_DISK_TTL_S (see
+        clear_cache()). Treat the returned dict as read-only.
     """
+    return _place_details_cached(place_id, language_code)
+
+
+@lru_cache(maxsize=4096)
+def _place_details_cached(place_id: str, language_code: str) -> Optional[Dict[str, Any]]:
+    """Cached worker behind place_details(): disk cache first, then HTTP."""
+    disk_key = f"{place_id}:{language_code}"
+    with _DETAILS_DISK_LOCK, shelve.open(_DETAILS_DISK_PATH) as db:
+        entry = db.get(disk_key)
+    if entry is not None and time.time() - entry[0] < DETAILS_DISK_TTL_S:
+        return entry[1]
+
     url = PLACES_DETAILS_URL_TMPL.format(place_id=place_id)
-    headers = {
-        "X-Goog-Api-Key": GOOGLE_API_KEY,
-        "X-Goog-FieldMask": ",".join([
-            "id",
-            "displayName",
-            "formattedAddress",
-            "rating",
-            "userRatingCount",
-            "primaryType",
-            "types",
-            "accessibilityOptions",
-            "regularOpeningHours",
-            "websiteUri",
-            "nationalPhoneNumber",
-            "location",
-        ]),
-    }
-    r = requests.get(url, headers=headers, params={"languageCode": language_code}, timeout=30)
+    r = _SESSION.get(url, headers=_DETAILS_HEADERS, params={"languageCode": language_code}, timeout=30)
+    if r.status_code == 404:
+        return None
     r.raise_for_status()
-    return r.json()
+    data = orjson.loads(r.content)
+
+    with _DETAILS_DISK_LOCK, shelve.open(_DETAILS_DISK_PATH) as db:
+        db[disk_key] = (time.time(), data)
+    return data
+
+
+def clear_cache(disk: bool = False) -> None:
+    """
+    Drop the in-process place_details() cache.
+
+    With disk=True the on-disk details cache is emptied as well.
+    """
+    _place_details_cached.cache_clear()
+
+    if disk:
+        with _DETAILS_DISK_LOCK, shelve.open(_DETAILS_DISK_PATH) as db:
+            db.clear()
+
+
+def place_details_many(
+    place_ids: List[str],
+    language_code: str = "en",
+    max_workers: int = 8,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Batch place_details() over a thread pool.
+
+    Parameters
+    ----------
+    place_ids : list[str]
+        Place IDs to fetch; duplicates are fetched once.
+
+    language_code : str
+        BCP-47 language code.
+
+    max_workers : int
+        Max concurrent requests (the calls are network-bound).
+
+    Returns
+    -------
+    list[dict | None]
+        Details in the same order as `place_ids`; None for places that no
+        longer exist (404). Other HTTP errors propagate.
+    """
+    if not place_ids:
+        return []
+
+    unique_ids = list(dict.fromkeys(place_ids))
+
+    def fetch(pid: str) -> Optional[Dict[str, Any]]:
+        return place_details(pid, language_code=language_code)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(unique_ids))) as executor:
+        by_id = dict(zip(unique_ids, executor.map(fetch, unique_ids)))
+
+    return [by_id[pid] for pid in place_ids]
+
+
+# Read-only stand-in for missing nested objects in summarize()
+_EMPTY = MappingProxyType({})
 
 
 def summarize(place: Dict[str, Any]) -> Dict[str, Any]:
@@ -108,32 +237,31 @@ def summarize(place: Dict[str, Any]) -> Dict[str, Any]:
     dict
         A unified item summary with keys compatible with cache.upsert_item_summary().
     """
-    name = (place.get("displayName") or {}).get("text")
-    acc = place.get("accessibilityOptions") or {}
-    hours = place.get("regularOpeningHours") or {}
-    weekday_desc = hours.get("weekdayDescriptions") or []
-    loc = place.get("location") or {}
+    get = place.get  # bound once; called for every field
+    acc = get("accessibilityOptions") or _EMPTY
+    hours = get("regularOpeningHours") or _EMPTY
+    loc = get("location") or _EMPTY
 
     return {
         # Unified identity
         "source": "google",
-        "item_id": place.get("id"),
+        "item_id": get("id"),
 
         # Shared fields
-        "name": name,
-        "address": place.get("formattedAddress"),
-        "rating": place.get("rating"),
-        "review_count": place.get("userRatingCount"),
-        "category_primary": place.get("primaryType"),
-        "types": place.get("types", []),
+        "name": (get("displayName") or _EMPTY).get("text"),
+        "address": get("formattedAddress"),
+        "rating": get("rating"),
+        "review_count": get("userRatingCount"),
+        "category_primary": get("primaryType"),
+        "types": get("types", []),
 
         # Google-specific fields
         "wheelchair_accessible_entrance": acc.get("wheelchairAccessibleEntrance"),
-        "opening_hours_weekday_descriptions": weekday_desc,
-        "website": place.get("websiteUri"),
-        "phone": place.get("nationalPhoneNumber"),
+        "opening_hours_weekday_descriptions": hours.get("weekdayDescriptions") or [],
+        "website": get("websiteUri"),
+        "phone": get("nationalPhoneNumber"),
 
         # Coordinates for routing
         "lat": loc.get("latitude"),
         "lng": loc.get("longitude"),
-    }
\ No newline at end of file
+    }
@@ -10,19 +10,160 @@ This module is meant to replace the notebook-defined pipeline functions so that:
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
 
 from .cache import (
+    normalize_city,
     get_city_snapshot_item_ids,
     save_city_snapshot_item_ids,
-    get_cached_item_summary,
-    upsert_item_summary,
+    get_cached_item_summaries,
+    upsert_item_summaries,
+    utc_now_iso,
 )
 
 from . import google_places as g
 from . import tripadvisor as ta
 
 
+def _lookup_summaries(
+    conn,
+    source: str,
+    ids: List[str],
+    fetch_summaries: Callable[[List[str]], List[Optional[Dict[str, Any]]]],
+    *,
+    known: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """
+    Read phase of ID resolution: cache hits plus fetched misses, NO writes.
+
+    - one SELECT for all cache hits
+    - cache misses fetched in one batch call (fetch_summaries, which runs
+      the HTTP calls concurrently)
+    - `known`: summaries the caller already fetched (e.g. during snapshot
+      construction); they count as fetched and are not requested again
+    - ids the provider no longer knows (fetch returned None, e.g. 404) are
+      left out of both dicts
+
+    Returns
+    -------
+    (cached, fetched)
+        Dicts keyed by item_id. `fetched` is what still has to be written
+        to the cache (see _write_city).
+    """
+    fetched: Dict[str, Dict[str, Any]] = dict(known or {})
+    cached = get_cached_item_summaries(conn, source, [i for i in ids if i not in fetched])
+
+    missing = list(dict.fromkeys(i for i in ids if i not in cached and i not in fetched))
+    if missing:
+        fetched.update(
+            (i, s) for i, s in zip(missing, fetch_summaries(missing)) if s is not None
+        )
+    return cached, fetched
+
+
+def _ordered_results(
+    ids: List[str],
+    cached: Dict[str, Dict[str, Any]],
+    fetched: Dict[str, Dict[str, Any]],
+    city_source: str,
+) -> List[Dict[str, Any]]:
+    """Summaries in snapshot order, tagged with _source/_city_source; unresolved ids are skipped."""
+    results: List[Dict[str, Any]] = []
+    for item_id in ids:
+        if item_id in cached:
+            s = cached[item_id]
+            s["_source"] = "cache"
+        elif item_id in fetched:
+            s = fetched[item_id]
+            s["_source"] = "api"
+        else:
+            continue
+
+        s["_city_source"] = city_source
+        results.append(s)
+
+    return results
+
+
+def _prune_dead_ids(
+    snapshot_ids: List[str],
+    looked_up: List[str],
+    cached: Dict[str, Dict[str, Any]],
+    fetched: Dict[str, Dict[str, Any]],
+) -> Optional[List[str]]:
+    """
+    Snapshot without the ids the provider no longer knows (404 -> unresolved).
+
+    Returns None when every looked-up id resolved (nothing to rewrite).
+    """
+    dead = {i for i in looked_up if i not in cached and i not in fetched}
+    if not dead:
+        return None
+    return [i for i in snapshot_ids if i not in dead]
+
+
+def _write_city(
+    conn,
+    city_key: str,
+    city_display: str,
+    source: str,
+    item_type: str,
+    snapshot_ids: Optional[List[str]],
+    fetched: Dict[str, Dict[str, Any]],
+    now: str,
+) -> None:
+    """
+    Write phase: snapshot (if computed) + fetched summaries in ONE short transaction.
+
+    Called only after all network I/O is done, so the SQLite write lock is
+    held for milliseconds rather than for the duration of HTTP fan-outs.
+    """
+    with conn:
+        if snapshot_ids is not None:
+            save_city_snapshot_item_ids(conn, city_key, city_display, source, item_type, snapshot_ids, now=now)
+        upsert_item_summaries(conn, list(fetched.values()), now=now)
+
+
+def _rank_tourist_attractions(conn, candidates: List[Dict[str, Any]], n: int) -> List[str]:
+    """
+    Filter + rank Google text-search candidates inside SQLite.
+
+    Candidates are staged in a TEMP table; SQLite keeps only places typed
+    'tourist_attraction' (via json_each over the types list) and orders them
+    by review count. Ties keep the API's order (rowid = insertion order).
+    """
+    conn.execute("""
+    CREATE TEMP TABLE IF NOT EXISTS google_candidates (
+        id                TEXT NOT NULL,
+        types_json        TEXT,
+        user_rating_count INTEGER
+    );
+    """)
+    conn.execute("DELETE FROM google_candidates;")
+    conn.executemany(
+        "INSERT INTO google_candidates (id, types_json, user_rating_count) VALUES (?, ?, ?)",
+        [
+            (p["id"], orjson.dumps(p.get("types") or []).decode(), p.get("userRatingCount"))
+            for p in candidates
+        ],
+    )
+
+    rows = conn.execute(
+        """
+        SELECT id FROM google_candidates c
+        WHERE EXISTS (
+            SELECT 1 FROM json_each(c.types_json) WHERE value = 'tourist_attraction'
+        )
+        ORDER BY COALESCE(user_rating_count, 0) DESC, rowid
+        LIMIT ?
+        """,
+        (n,),
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
 def top10_google_attractions(
     conn,
     city: str,
@@ -33,11 +174,14 @@ def top10_google_attractions(
     """Top-N Google tourist attractions by review_count (static city snapshot)."""
     source, item_type = "google", "attraction"
 
+    city_key = normalize_city(city)
+
     # 1) Snapshot lookup
-    ids = get_city_snapshot_item_ids(conn, city, source, item_type)
+    ids = get_city_snapshot_item_ids(conn, city_key, source, item_type)
     city_source = "city_snapshot" if ids else "computed"
 
     # 2) Compute snapshot once (if missing)
+    snapshot_ids: Optional[List[str]] = None
     if not ids:
         candidates = g.text_search_many(
             f"tourist attractions in {city}",
@@ -45,32 +189,33 @@ def top10_google_attractions(
             max_results=search_pool,
         )
 
-        # Strict filter: only tourist attractions
-        filtered = [p for p in candidates if "tourist_attraction" in (p.get("types") or [])]
-
-        # Rank by number of reviews
-        ranked = sorted(filtered, key=lambda p: int(p.get("userRatingCount", 0) or 0), reverse=True)
+        # TEMP-table work only; the with-block ends the implicit transaction
+        # before any further HTTP calls
+        with conn:
+            ids = _rank_tourist_attractions(conn, candidates, n)
+        snapshot_ids = ids
 
-        ids = [p["id"] for p in ranked[:n]]
-        save_city_snapshot_item_ids(conn, city, source, item_type, ids)
+    # 3) Resolve IDs -> cached details (or fetch once)
+    top_ids = ids[:n]
+    cached, fetched = _lookup_summaries(
+        conn,
+        source,
+        top_ids,
+        lambda pids: [
+            g.summarize(d) if d is not None else None
+            for d in g.place_details_many(pids, language_code=language)
+        ],
+    )
 
-    # 3) Resolve IDs -> cached details (or fetch once, then cache)
-    results: List[Dict[str, Any]] = []
-    for pid in ids[:n]:
-        cached = get_cached_item_summary(conn, source, pid)
-        if cached:
-            s = cached
-            s["_source"] = "cache"
-        else:
-            details = g.place_details(pid, language_code=language)
-            s = g.summarize(details)
-            upsert_item_summary(conn, s)
-            s["_source"] = "api"
+    # Places that have since disappeared (404) are dropped from the snapshot
+    pruned = _prune_dead_ids(ids, top_ids, cached, fetched)
+    if pruned is not None:
+        snapshot_ids = pruned
 
-        s["_city_source"] = city_source
-        results.append(s)
+    # 4) All network I/O done: one short write transaction (one timestamp) per city
+    _write_city(conn, city_key, city.strip(), source, item_type, snapshot_ids, fetched, utc_now_iso())
 
-    return results
+    return _ordered_results(top_ids, cached, fetched, city_source)
 
 
 def top10_tripadvisor(
@@ -93,60 +238,60 @@ def top10_tripadvisor(
     """
     source = "tripadvisor"
 
+    city_key = normalize_city(city)
+
     # 1) Snapshot lookup
-    ids = get_city_snapshot_item_ids(conn, city, source, item_type)
+    ids = get_city_snapshot_item_ids(conn, city_key, source, item_type)
     city_source = "city_snapshot" if ids else "computed"
 
     # 2) Compute snapshot once (if missing)
+    snapshot_ids: Optional[List[str]] = None
+    accepted: List[Dict[str, Any]] = []
     if not ids:
         city_geo = ta.get_city_location(city, language=language)
-        candidates = ta.search(city_geo, item_type=item_type, language=language)
+        ranked = ta.search_top_k(city_geo, k=search_pool, item_type=item_type, language=language)
 
-        ranked = sorted(candidates, key=lambda p: int(p.get("num_reviews", 0) or 0), reverse=True)
+        ranked_ids = [str(p.get("location_id") or "") for p in ranked]
+        # drop empties and duplicate hits (keeps first = highest ranked)
+        ranked_ids = list(dict.fromkeys(lid for lid in ranked_ids if lid))
 
-        accepted_ids: List[str] = []
-        for p in ranked[:search_pool]:
-            lid = str(p.get("location_id") or "")
-            if not lid:
-                continue
-
-            # details -> summarize -> filter by groups
-            s = ta.details_summarized_filtered(
-                lid,
+        # details -> summarize -> filter by groups, fetched concurrently
+        # in batches of n so we stop soon after n are accepted
+        for start in range(0, len(ranked_ids), n):
+            batch = ta.details_many(
+                ranked_ids[start:start + n],
                 language=language,
                 allow_groups=allow_groups,
                 deny_groups=deny_groups,
             )
-            if not s:
-                continue
-
-            # Cache summary immediately so step 3 usually hits cache
-            upsert_item_summary(conn, s)
-
-            accepted_ids.append(lid)
-            if len(accepted_ids) >= n:
+            accepted.extend(s for s in batch if s)
+            if len(accepted) >= n:
                 break
-
-        ids = accepted_ids
-        save_city_snapshot_item_ids(conn, city, source, item_type, ids)
-
-    # 3) Resolve IDs -> cached details (or fetch once, then cache)
-    results: List[Dict[str, Any]] = []
-    for lid in ids[:n]:
-        cached = get_cached_item_summary(conn, source, lid)
-        if cached:
-            s = cached
-            s["_source"] = "cache"
-        else:
-            details = ta.details(lid, language=language)
-            s = ta.summarize(details)
-            upsert_item_summary(conn, s)
-            s["_source"] = "api"
-
-        s["_city_source"] = city_source
-        results.append(s)
-
-    return results
+        accepted = accepted[:n]
+
+        ids = [s["item_id"] for s in accepted]
+        snapshot_ids = ids
+
+    # 3) Resolve IDs -> cached details (or fetch once); accepted summaries
+    #    from step 2 are reused, not requested again
+    top_ids = ids[:n]
+    cached, fetched = _lookup_summaries(
+        conn,
+        source,
+        top_ids,
+        lambda lids: ta.details_many(lids, language=language),
+        known={s["item_id"]: s for s in accepted},
+    )
+
+    # Locations that have since disappeared (404) are dropped from the snapshot
+    pruned = _prune_dead_ids(ids, top_ids, cached, fetched)
+    if pruned is not None:
+        snapshot_ids = pruned
+
+    # 4) All network I/O done: one short write transaction (one timestamp) per city
+    _write_city(conn, city_key, city.strip(), source, item_type, snapshot_ids, fetched, utc_now_iso())
+
+    return _ordered_results(top_ids, cached, fetched, city_source)
 
 
 def unified_search(
@@ -13,7 +13,9 @@ Key responsibilities:
     - Return the two closest candidates
 
 Dependencies:
-    - math (for fallback haversine)
+    - math (scalar haversine)
+    - numpy (vectorized haversine over all candidates; installed with pandas,
+      imported on first use, pure-Python fallback if missing)
     - In final version: Google Routes API
 
 Notes:
@@ -22,9 +24,47 @@ Notes:
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List
+from functools import lru_cache
+import heapq
+from typing import TYPE_CHECKING, Any, Dict, List
 import math
 
+if TYPE_CHECKING:
+    import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Below this many candidates numpy's per-call overhead outweighs the
+# vectorized trig, so the scalar path is used instead.
+_VECTORIZE_MIN = 64
+
+
+@lru_cache(maxsize=None)
+def _load_numpy():
+    """Import numpy on first use (keeps module import cheap); None if unavailable."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _haversine_rank(a_lat: float, a_lng: float, b_lat: float, b_lng: float) -> float:
+    """
+    Haversine term h = sin²(Δlat/2) + cos(lat1)·cos(lat2)·sin²(Δlng/2).
+
+    Distance is 2·R·asin(√h), a strictly increasing function of h on [0, 1],
+    so h orders candidates exactly like the distance does without paying for
+    sqrt/asin. Use it whenever only the ranking matters.
+    """
+    lat1, lon1 = math.radians(a_lat), math.radians(a_lng)
+    lat2, lon2 = math.radians(b_lat), math.radians(b_lng)
+
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+
+    return math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+
 
 def _haversine_km(a_lat: float, a_lng: float, b_lat: float, b_lng: float) -> float:
     """
@@ -35,15 +75,34 @@ def _haversine_km(a_lat: float, a_lng: float, b_lat: float, b_lng: float) -> flo
     float
         Distance in kilometers.
     """
-    R = 6371.0
-    lat1, lon1 = math.radians(a_lat), math.radians(a_lng)
-    lat2, lon2 = math.radians(b_lat), math.radians(b_lng)
+    h = _haversine_rank(a_lat, a_lng, b_lat, b_lng)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(h))
+
+
+def _haversine_rank_vec(lat0: float, lng0: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """
+    Vectorized _haversine_rank from one point to many.
+
+    Parameters
+    ----------
+    lat0, lng0 : float
+        Start coordinate (degrees).
+    lats, lngs : np.ndarray
+        1-D float arrays of candidate coordinates (degrees).
+
+    Returns
+    -------
+    np.ndarray
+        Haversine term h per candidate (orders like distance; see _haversine_rank).
+    """
+    np = _load_numpy()
+    lat1, lon1 = math.radians(lat0), math.radians(lng0)
+    lat2, lon2 = np.radians(lats), np.radians(lngs)
 
     dlat = lat2 - lat1
     dlon = lon2 - lon1
 
-    h = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
-    return 2 * R * math.asin(math.sqrt(h))
+    return np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
 
 
 def closest_two_fallback(start: Dict[str, Any], others: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -61,15 +120,44 @@ def closest_two_fallback(start: Dict[str, Any], others: List[Dict[str, Any]]) ->
     Returns
     -------
     list[dict]
-        The two closest items by haversine distance (km).
+        The two closest items by haversine distance.
     """
     if start.get("lat") is None or start.get("lng") is None:
         raise ValueError("Start item must have lat/lng for distance calculation.")
 
     valid = [o for o in others if o.get("lat") is not None and o.get("lng") is not None]
 
-    ranked = sorted(
-        valid,
-        key=lambda o: _haversine_km(start["lat"], start["lng"], o["lat"], o["lng"]),
-    )
-    return ranked[:2]
\ No newline at end of file
+    if not valid:
+        return []
+
+    np = _load_numpy() if len(valid) >= _VECTORIZE_MIN else None
+    if np is None:
+        # Start-point terms are the same for every candidate: compute them once
+        lat1, lon1 = math.radians(start["lat"]), math.radians(start["lng"])
+        cos_lat1 = math.cos(lat1)
+
+        # Rank by the haversine term h (see _haversine_rank): no sqrt/asin per item
+        def rank(o: Dict[str, Any]) -> float:
+            lat2 = math.radians(o["lat"])
+            dlat = lat2 - lat1
+            dlon = math.radians(o["lng"]) - lon1
+            return math.sin(dlat / 2) ** 2 + cos_lat1 * math.cos(lat2) * math.sin(dlon / 2) ** 2
+
+        # Bounded top-2 heap: each candidate is ranked once and no full sort
+        # is done; ties keep input order (nsmallest == sorted(...)[:2])
+        return heapq.nsmallest(2, valid, key=rank)
+
+    # One vectorized trig pass over all candidates instead of a Python-level
+    # sort key per item
+    n = len(valid)
+    lats = np.fromiter((o["lat"] for o in valid), dtype=np.float64, count=n)
+    lngs = np.fromiter((o["lng"] for o in valid), dtype=np.float64, count=n)
+    d = _haversine_rank_vec(start["lat"], start["lng"], lats, lngs)
+
+    # O(n) selection of the two smallest. Everything tied with the cut-off is
+    # kept and stable-sorted, so ties resolve in input order (as sorted() did).
+    k = min(2, n)
+    cut = d[np.argpartition(d, k - 1)[:k]].max()
+    cand = np.flatnonzero(d <= cut)
+    idx = cand[np.argsort(d[cand], kind="stable")][:k]
+    return [valid[i] for i in idx]
\ No newline at end of file
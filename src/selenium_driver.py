@@ -11,8 +11,11 @@ Role in architecture:
 
 Key responsibilities:
     - Configure Chrome options (language, user-agent, headless mode)
+    - Skip downloading resources the scraper never reads (images, fonts)
     - Apply geolocation override (for consistent Maps behavior)
     - Return a ready-to-use WebDriver instance
+    - Reuse long-lived browsers: one shared driver per process, or a
+      fixed-size DriverPool for parallel scraping
 
 Dependencies:
     - selenium.webdriver
@@ -22,11 +25,48 @@ Notes:
     Google Maps rendering depends heavily on region and language.
     For reliable execution, a VPN connected to an English-speaking
     country is recommended to ensure consistent DOM structure.
+
+    Starting Chrome costs hundreds of ms and a few hundred MB, so callers
+    that scrape repeatedly should prefer get_shared_driver() or a
+    DriverPool over calling make_driver() each time.
 """
 
+import atexit
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 
+# Chrome flags that trim startup and background work the scraper never needs.
+# (--no-sandbox is intentionally absent: it is only required when running
+# Chrome as root in a container and weakens isolation everywhere else.)
+CHROME_SPEED_FLAGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-translate",
+    "--mute-audio",
+    "--disable-features=Translate,OptimizationHints",
+]
+
+# Fixed position reported to Maps (New York City)
+GEOLOCATION_OVERRIDE = {
+    "latitude": 40.7128,
+    "longitude": -74.0060,
+    "accuracy": 100,
+}
+
+# Resource URL patterns blocked via CDP (see make_driver)
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif",
+    "*.woff", "*.woff2", "*.ttf",
+    "*/gen_204*", "*/analytics*",
+]
+
 
 def make_driver(headless: bool = True):
     """
@@ -45,12 +85,22 @@ def make_driver(headless: bool = True):
     options = Options()
     options.add_argument("--lang=en-US")
 
+    # Return from get() at DOMContentLoaded instead of the full load event
+    # (trackers, late beacons); every element we use is awaited explicitly
+    options.page_load_strategy = "eager"
+    for flag in CHROME_SPEED_FLAGS:
+        options.add_argument(flag)
+
     if headless:
         options.add_argument("--headless=new")
 
+    # The scraper only reads the DOM: don't download images or show notifications
+    options.add_argument("--blink-settings=imagesEnabled=false")
     options.add_experimental_option("prefs", {
         "intl.accept_languages": "en-US,en",
         "profile.default_content_setting_values.geolocation": 2,
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2,
     })
 
     options.add_argument(
@@ -60,11 +110,172 @@ def make_driver(headless: bool = True):
 
     driver = webdriver.Chrome(options=options)
 
-    # Geolocation override (stabilizes Maps rendering)
-    driver.execute_cdp_cmd("Emulation.setGeolocationOverride", {
-        "latitude": 40.7128,
-        "longitude": -74.0060,
-        "accuracy": 100,
-    })
+    # Drop bytes the scraper never reads: images, web fonts and logging beacons.
+    # Stylesheets are NOT blocked: the waits check element visibility and
+    # clickability, which need the page's real layout.
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+    # Geolocation override (stabilizes Maps rendering). One CDP call per
+    # driver: the override stays on the tab across navigations, so reused
+    # drivers (get_shared_driver / DriverPool) never pay it again.
+    driver.execute_cdp_cmd("Emulation.setGeolocationOverride", GEOLOCATION_OVERRIDE)
+
+    return driver
+
+
+# -----------------------------
+# Driver reuse
+# -----------------------------
+
+_SHARED_DRIVER = None
+_SHARED_LOCK = threading.Lock()
+
+
+def get_shared_driver(headless: bool = True):
+    """
+    Return the process-wide Chrome driver, starting it on first use.
+
+    Parameters
+    ----------
+    headless : bool, default=True
+        Only used when the driver is first created.
+
+    Returns
+    -------
+    webdriver.Chrome
+        Shared driver. Do not quit() it directly; it is closed at
+        interpreter exit or via close_shared_driver().
+    """
+    global _SHARED_DRIVER
+    with _SHARED_LOCK:
+        if _SHARED_DRIVER is None:
+            _SHARED_DRIVER = make_driver(headless=headless)
+        return _SHARED_DRIVER
+
+
+def close_shared_driver() -> None:
+    """Quit the shared driver if one is running (safe to call repeatedly)."""
+    global _SHARED_DRIVER
+    with _SHARED_LOCK:
+        driver, _SHARED_DRIVER = _SHARED_DRIVER, None
+    if driver is not None:
+        driver.quit()
+
+
+atexit.register(close_shared_driver)
+
+
+class DriverPool:
+    """
+    Fixed-size pool of long-lived Chrome drivers for worker threads.
+
+    Drivers are started lazily (at most `size`), handed out with lease()
+    and returned to the pool afterwards, so a scrape of N pages starts at
+    most `size` browsers instead of N.
+
+    If a driver fails to start while others are running, the pool shrinks
+    by that slot and the lease waits for a running driver instead; the
+    error is raised only when no driver is running at all.
+
+    Parameters
+    ----------
+    size : int, default=4
+        Maximum number of drivers (including `borrowed` ones).
+    headless : bool, default=True
+        Passed to make_driver() when no `factory` is given.
+    factory : callable, optional
+        Zero-argument callable returning a new WebDriver.
+    borrowed : sequence, optional
+        Already running drivers owned by the caller. They are lent out first
+        and count towards `size`, but close() does not quit them.
+
+    Usage:
+        with DriverPool(size=4) as pool:
+            with pool.lease() as driver:
+                ...
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        headless: bool = True,
+        factory: Optional[Callable[[], Any]] = None,
+        borrowed: Sequence[Any] = (),
+    ):
+        self.size = size
+        self._factory = factory or (lambda: make_driver(headless=headless))
+        self._cond = threading.Condition()
+        self._idle: List[Any] = list(borrowed)
+        self._owned: List[Any] = []          # started by this pool; quit on close()
+        self._count = len(self._idle)        # drivers running or being started
+        self._closed = False
+
+    def _acquire(self):
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._count < self.size:
+                    self._count += 1  # reserve a slot, start Chrome outside the lock
+                    break
+                self._cond.wait()  # woken by release, failed start or close
+
+        try:
+            driver = self._factory()
+        except Exception:
+            with self._cond:
+                self._count -= 1
+                if self._count == 0:
+                    self._cond.notify()  # let a waiter retry the freed slot
+                    raise
+                # Other drivers are running: drop this slot and make do with them
+                self.size -= 1
+            return self._acquire()
+        except BaseException:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            closed = self._closed
+            if not closed:
+                self._owned.append(driver)
+        if closed:
+            driver.quit()
+            raise RuntimeError("DriverPool is closed.")
+        return driver
+
+    def _release(self, driver) -> None:
+        with self._cond:
+            if not self._closed:
+                self._idle.append(driver)
+                self._cond.notify()
+
+    @contextmanager
+    def lease(self) -> Iterator[Any]:
+        """Borrow a driver for the duration of the with-block."""
+        driver = self._acquire()
+        try:
+            yield driver
+        finally:
+            self._release(driver)
+
+    def close(self) -> None:
+        """Quit every driver the pool has started and wake all waiting threads."""
+        with self._cond:
+            self._closed = True
+            owned, self._owned = self._owned, []
+            self._idle = []
+            self._cond.notify_all()
+        for driver in owned:
+            driver.quit()
+
+    def __enter__(self) -> "DriverPool":
+        return self
 
-    return driver
\ No newline at end of file
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -29,64 +29,95 @@ Notes:
 """
 
 from __future__ import annotations
-from typing import Dict, List, Optional
-import json
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import sqlite3
 import datetime
 import time
 import re
+from urllib.parse import quote_plus
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
+from .cache import normalize_city
+from .selenium_driver import DriverPool
+
+
+# ---------------------------------------------------------------------
+# Google Maps URLs and locators
+# ---------------------------------------------------------------------
+
+MAPS_URL = "https://www.google.com/maps"
+MAPS_SEARCH_URL = "https://www.google.com/maps/search/?api=1&query={query}"
+PLACE_URL_FRAGMENT = "/maps/place/"
+
+CONSENT_BUTTON = (
+    By.XPATH,
+    '//button[.//span[contains(text(),"Accept all") '
+    'or contains(text(),"Reject all")]]',
+)
+SEARCH_BOX = (By.ID, "searchboxinput")
+FIRST_RESULT = (By.CSS_SELECTOR, "a.hfpxzc")
+PEAK_SECTION = (By.CSS_SELECTOR, "div.UmE4Qe")
+PEAK_BAR = (By.CSS_SELECTOR, "div.dpoVLd")
+
 
 # ---------------------------------------------------------------------
 # Database utilities
 # ---------------------------------------------------------------------
 
-def get_attraction_names(city: str, conn: sqlite3.Connection) -> Optional[List[str]]:
+def get_attraction_names(city_key: str, conn: sqlite3.Connection) -> Optional[List[str]]:
     """
     Retrieve stored Google attraction names for a given city.
 
+    Parameters
+    ----------
+    city_key : str
+        Normalized city key (see cache.normalize_city()).
+
     Returns
     -------
     list[str] or None
         Ordered list of attraction names,
         or None if the city is not stored.
+
+    Notes
+    -----
+    Uses SQLite's JSON1 json_each() to expand the snapshot's item_ids_json
+    and join it to item_summary in a single query. Rows come back in
+    snapshot order (j.key is the array index). The LEFT JOINs keep one
+    all-NULL row for an empty snapshot so "stored but empty" ([]) stays
+    distinguishable from "not stored" (None).
     """
-    citykey = city.strip().lower()
     cur = conn.cursor()
+    cur.row_factory = sqlite3.Row
+    rows = cur.execute(
+        "SELECT s.name FROM city_top10 c "
+        "LEFT JOIN json_each(c.item_ids_json) j "
+        "LEFT JOIN item_summary s ON s.source = c.source AND s.item_id = j.value "
+        "WHERE c.city_key = ? AND c.source = ? AND c.item_type = ? "
+        "ORDER BY j.key",
+        (city_key, "google", "attraction")
+    ).fetchall()
 
-    row = cur.execute(
-        "SELECT item_ids_json FROM city_top10 "
-        "WHERE city_key = ? AND source = ? AND item_type = ?",
-        (citykey, "google", "attraction")
-    ).fetchone()
-
-    if not row:
+    if not rows:
         return None
 
-    place_ids = json.loads(row[0])
-    if not place_ids:
-        return []
-
-    placeholders = ",".join("?" * len(place_ids))
-    name_rows = cur.execute(
-        f"SELECT item_id, name FROM item_summary "
-        f"WHERE source = ? AND item_id IN ({placeholders})",
-        ["google", *place_ids]
-    ).fetchall()
-
-    name_map = {pid: name for pid, name in name_rows}
-    return [name_map[pid] for pid in place_ids if pid in name_map]
+    return [row["name"] for row in rows if row["name"] is not None]
 
 
 # ---------------------------------------------------------------------
 # Peak-hours parsing
 # ---------------------------------------------------------------------
 
+# Compiled once: _parse_busy_bar runs for every bar (up to 24 per attraction)
+_NORDIC_RE = re.compile(r"^(\d+)\D+?kl\.\s*(\d{2})\d{2}")
+_ENG_RE = re.compile(r"(\d+)%.*?(\d{1,2})\s*(am|pm)", re.IGNORECASE)
+
+
 def _parse_busy_bar(aria: str):
     """
     Parse one Google Maps peak-hours aria-label.
@@ -100,11 +131,13 @@ def _parse_busy_bar(aria: str):
     tuple[int, int] or None
         (hour_24, percentage)
     """
-    m = re.search(r"^(\d+)\D+?kl\.\s*(\d{2})\d{2}", aria.strip())
+    a = aria.strip()
+
+    m = _NORDIC_RE.search(a)
     if m:
         return int(m.group(2)), int(m.group(1))
 
-    m = re.search(r"(\d+)%.*?(\d{1,2})\s*(am|pm)", aria, re.IGNORECASE)
+    m = _ENG_RE.search(a)
     if m:
         pct, h, mer = int(m.group(1)), int(m.group(2)), m.group(3).lower()
         hour_24 = (h % 12) + (12 if mer == "pm" else 0)
@@ -119,11 +152,7 @@ def dismiss_google_consent(driver):
     """
     try:
         accept_btn = WebDriverWait(driver, 8).until(
-            EC.element_to_be_clickable((
-                By.XPATH,
-                '//button[.//span[contains(text(),"Accept all") '
-                'or contains(text(),"Reject all")]]'
-            ))
+            EC.element_to_be_clickable(CONSENT_BUTTON)
         )
         accept_btn.click()
         time.sleep(1)
@@ -135,46 +164,54 @@ def dismiss_google_consent(driver):
 # Core scraping logic
 # ---------------------------------------------------------------------
 
+def open_maps(driver):
+    """
+    Load Google Maps once and clear the consent banner for this session.
+
+    Notes:
+        The consent choice is stored in the browser's cookies, so later
+        searches on the same driver can go straight to a search URL.
+    """
+    driver.get(MAPS_URL)
+    dismiss_google_consent(driver)
+    WebDriverWait(driver, 15).until(EC.presence_of_element_located(SEARCH_BOX))
+
+
 def get_current_busyness(driver, attraction_name: str) -> Optional[List[Optional[int]]]:
     """
     Scrape full-day hourly busyness for a single attraction.
 
+    Expects open_maps(driver) to have been called once beforehand.
+
     Returns
     -------
     list[int|None] or None
         24-length list indexed by hour (0–23),
         or None if no peak-hours section is available.
     """
-    driver.get("https://www.google.com/maps")
-    time.sleep(2)
-    dismiss_google_consent(driver)
-
-    search_bar = WebDriverWait(driver, 15).until(
-        EC.presence_of_element_located((By.ID, "searchboxinput"))
-    )
-
-    search_bar.clear()
-    search_bar.send_keys(attraction_name)
-    search_bar.submit()
-    time.sleep(3)
+    driver.get(MAPS_SEARCH_URL.format(query=quote_plus(attraction_name)))
 
+    # Maps either opens the place directly or shows a result list
     try:
-        WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, "a.hfpxzc"))
-        ).click()
-        time.sleep(3)
+        WebDriverWait(driver, 10).until(EC.any_of(
+            EC.url_contains(PLACE_URL_FRAGMENT),
+            EC.element_to_be_clickable(FIRST_RESULT),
+        ))
+        if PLACE_URL_FRAGMENT not in driver.current_url:
+            driver.find_element(*FIRST_RESULT).click()
+            WebDriverWait(driver, 10).until(EC.url_contains(PLACE_URL_FRAGMENT))
     except TimeoutException:
         pass
 
     try:
         peak_section = WebDriverWait(driver, 6).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.UmE4Qe"))
+            EC.presence_of_element_located(PEAK_SECTION)
         )
     except TimeoutException:
         return None
 
     hourly_data: List[Optional[int]] = [None] * 24
-    bars = peak_section.find_elements(By.CSS_SELECTOR, "div.dpoVLd")
+    bars = peak_section.find_elements(*PEAK_BAR)
 
     for bar in bars:
         aria = bar.get_attribute("aria-label") or ""
@@ -192,27 +229,70 @@ def scrape_peak_hours(
     conn: sqlite3.Connection,
     driver,
     busyness_data: Dict[str, Dict],
+    *,
+    driver_factory: Optional[Callable[[], Any]] = None,
+    num_workers: int = 4,
 ):
     """
     Scrape peak-hours data for all stored attractions of a city.
 
     Results are stored in the provided `busyness_data` dictionary.
+
+    Parameters
+    ----------
+    conn : sqlite3.Connection
+        Only read from. When scraping many cities, a db.memory_snapshot()
+        copy keeps these lookups off the on-disk database.
+
+    driver_factory : callable, optional
+        Zero-argument callable returning a new WebDriver (e.g. make_driver).
+        When given, up to `num_workers - 1` extra drivers are started on
+        demand (via a DriverPool) and attractions are scraped in parallel;
+        the extra drivers are quit afterwards. An extra driver that fails to
+        start (or to open Maps) is skipped and the scrape continues on the
+        running ones, at least `driver`. Without it, scraping stays
+        sequential on `driver`.
+
+    num_workers : int, default=4
+        Maximum number of browsers used concurrently (including `driver`).
     """
     scraped_at = datetime.datetime.now().strftime("%H:%M")
-    city_key = city.strip()
+    city_display = city.strip()
 
-    names = get_attraction_names(city_key, conn)
+    names = get_attraction_names(normalize_city(city), conn)
     if not names:
         return
 
-    attractions = {}
-
-    for name in names:
-        hourly = get_current_busyness(driver, name)
-        attractions[name] = hourly
-        time.sleep(2)
-
-    busyness_data[city_key] = {
+    workers = min(num_workers, len(names)) if driver_factory is not None else 1
+
+    def start_driver():
+        d = driver_factory()
+        try:
+            open_maps(d)
+        except BaseException:
+            d.quit()
+            raise
+        return d
+
+    def scrape_one(name: str) -> Optional[List[Optional[int]]]:
+        with pool.lease() as d:
+            try:
+                return get_current_busyness(d, name)
+            finally:
+                time.sleep(2)
+
+    open_maps(driver)
+
+    # Each worker thread leases one browser at a time. `driver` is lent out
+    # first and stays open; extra drivers are started on demand (up to
+    # `workers` in total) and quit when the pool closes, even on errors.
+    # Since `driver` is always running, a failed start only shrinks the pool.
+    with DriverPool(size=workers, factory=start_driver, borrowed=[driver]) as pool:
+        # map() keeps results in snapshot order
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            hourly_results = list(executor.map(scrape_one, names))
+
+    busyness_data[city_display] = {
         "scraped_at": scraped_at,
-        "attractions": attractions,
-    }
\ No newline at end of file
+        "attractions": dict(zip(names, hourly_results)),
+    }
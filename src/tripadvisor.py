@@ -2,11 +2,14 @@
 DABN23 Project — TripAdvisor Content API Provider
 
 Provider layer responsibilities:
-- Resolve a city to geo coords
-- Search candidates near city coords
-- Fetch details for a location_id (with rate-limit backoff)
+- Resolve a city to geo coords (cached in-process)
+- Search candidates near city coords (optionally only the top-k by reviews)
+- Fetch details for a location_id (with rate-limit backoff and
+  ETag / Last-Modified revalidation against a small on-disk cache)
+- Fetch many details concurrently (details_many)
 - Normalize into unified schema
 - Provide optional group-based filtering helpers
+- Reuse one pooled HTTP session for all calls
 
 IMPORTANT:
 - TripAdvisor 'groups' are only reliably available in the details response.
@@ -14,33 +17,97 @@ IMPORTANT:
 
 from __future__ import annotations
 
+import heapq
+import os
+import random
+import shelve
+import sys
+import tempfile
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 from .config import TA_API_KEY
 
 TA_SEARCH_URL = "https://api.content.tripadvisor.com/api/v1/location/search"
 TA_DETAILS_URL = "https://api.content.tripadvisor.com/api/v1/location/{location_id}/details"
 
+# Default fan-out of details_many(). requests speaks HTTP/1.1 only (no
+# multiplexing), so each concurrent call needs its own keep-alive connection.
+DETAILS_MAX_WORKERS = 8
+
+# Keep-alive connections kept per host. details_many() caps its worker count
+# at this, so every worker can hold a warm connection.
+_POOL_MAXSIZE = 32
+
+# Shared keep-alive session: TCP/TLS setup is paid once, not per request.
+# Retries stay manual (see details()) so 429 handling is explicit.
+# Response bodies are decoded with orjson straight from r.content (bytes),
+# skipping requests' charset detection and the stdlib json parser.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=16, pool_maxsize=_POOL_MAXSIZE, max_retries=0),
+)
+
+# On-disk validator cache for details(): "<location_id>:<language>" ->
+# (etag, last_modified, body bytes). Survives restarts so repeated notebook
+# runs revalidate with a conditional GET (304 = no body) instead of
+# downloading every details payload again. shelve is not thread-safe, so
+# every access goes through _DETAILS_DISK_LOCK (details_many uses threads).
+_DETAILS_DISK_PATH = os.path.join(tempfile.gettempdir(), "dabn23_ta_details")
+_DETAILS_DISK_LOCK = threading.Lock()
+
 
 # -----------------------------
 # City resolution (geo lookup)
 # -----------------------------
 
 def get_city_location(city: str, language: str = "en") -> Dict[str, Any]:
-    """Resolve a city string into a TripAdvisor 'geo' entry."""
+    """
+    Resolve a city string into a TripAdvisor 'geo' entry.
+
+    Cached per (normalized city, language) for the lifetime of the process;
+    see clear_cache(). Only the cache key is case-folded: the API receives
+    the city as given (stripped).
+    """
+    city = city.strip()
+    key = (city.lower(), language)
+    with _CITY_CACHE_LOCK:
+        geo = _CITY_CACHE.get(key)
+    if geo is None:
+        geo = _fetch_city_location(city, language)
+        with _CITY_CACHE_LOCK:
+            _CITY_CACHE[key] = geo
+    return dict(geo)
+
+
+# (lowercased city, language) -> geo entry. A plain dict rather than
+# lru_cache so the key can be normalized without changing the searchQuery.
+_CITY_CACHE: Dict[Tuple[str, str], Dict[str, Any]] = {}
+_CITY_CACHE_LOCK = threading.Lock()
+
+
+def _fetch_city_location(city: str, language: str) -> Dict[str, Any]:
+    """Uncached worker behind get_city_location()."""
     params = {
         "key": TA_API_KEY,
         "searchQuery": city,
         "category": "geos",
         "language": language,
     }
-    r = requests.get(TA_SEARCH_URL, params=params, timeout=30)
+    r = _SESSION.get(TA_SEARCH_URL, params=params, timeout=30)
     r.raise_for_status()
 
-    results = r.json().get("data", [])
+    results = orjson.loads(r.content).get("data", [])
     if not results:
         raise ValueError(f"Could not resolve city: {city}")
 
@@ -84,41 +151,165 @@ def search(
     else:
         params["searchQuery"] = city_geo.get("name")
 
-    r = requests.get(TA_SEARCH_URL, params=params, timeout=30)
+    r = _SESSION.get(TA_SEARCH_URL, params=params, timeout=30)
     r.raise_for_status()
-    return r.json().get("data", [])
+    return orjson.loads(r.content).get("data", [])
+
+
+def _num_reviews(p: Dict[str, Any]) -> int:
+    return int(p.get("num_reviews", 0) or 0)
+
+
+def search_top_k(
+    city_geo: Dict[str, Any],
+    k: int = 10,
+    item_type: str = "attraction",
+    language: str = "en",
+) -> List[Dict[str, Any]]:
+    """
+    search() reduced to the k candidates with the most reviews (most first).
+
+    Notes:
+    - Selection uses a bounded heap (heapq.nlargest): O(N log k) instead of
+      sorting all N candidates; ties keep the API's order, as sorted() would.
+    - The response is parsed in full (orjson); a streaming parser would only
+      pay off for far larger payloads than the Content API returns.
+    """
+    candidates = search(city_geo, item_type=item_type, language=language)
+    return heapq.nlargest(k, candidates, key=_num_reviews)
 
 
 # -----------------------------
 # Details (rate-limit resilient)
 # -----------------------------
 
-def details(location_id: str, language: str = "en", max_retries: int = 3) -> Dict[str, Any]:
+def _retry_after_seconds(r: requests.Response) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP-date) into seconds.
+
+    Returns None if the header is missing or unparseable.
+    """
+    value = (r.headers.get("Retry-After") or "").strip()
+    if not value:
+        return None
+
+    if value.isdigit():
+        return float(value)
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+def details(location_id: str, language: str = "en", max_retries: int = 3) -> Optional[Dict[str, Any]]:
     """
     Fetch detailed information for one TripAdvisor location_id.
 
-    Retries on HTTP 429 with exponential backoff: 1s, 2s, 4s...
+    Returns None if the location does not exist (HTTP 404), so bulk fetches
+    can skip stale ids without raising; other HTTP errors still raise.
+
+    Retries on HTTP 429: waits as long as the server's Retry-After header
+    asks, falling back to exponential backoff (1s, 2s, 4s...) without it.
+    A little random jitter keeps parallel workers from retrying in lockstep.
+
+    Responses are cached per (location_id, language) for the lifetime of the
+    process (see clear_cache()); treat the returned dict as read-only.
+    Across processes, the last body is kept on disk with its ETag /
+    Last-Modified validators and reused when the server answers 304.
     """
+    return _details_cached(str(location_id), language, max_retries)
+
+
+def _disk_get(key: str) -> Optional[tuple]:
+    with _DETAILS_DISK_LOCK, shelve.open(_DETAILS_DISK_PATH) as db:
+        return db.get(key)
+
+
+def _disk_put(key: str, entry: tuple) -> None:
+    with _DETAILS_DISK_LOCK, shelve.open(_DETAILS_DISK_PATH) as db:
+        db[key] = entry
+
+
+@lru_cache(maxsize=1024)
+def _details_cached(location_id: str, language: str, max_retries: int) -> Optional[Dict[str, Any]]:
+    """Cached worker behind details(): conditional HTTP fetch + 429 retry loop."""
     url = TA_DETAILS_URL.format(location_id=location_id)
     params = {"key": TA_API_KEY, "language": language}
 
+    disk_key = f"{location_id}:{language}"
+    cached = _disk_get(disk_key)
+
+    headers = {}
+    if cached is not None:
+        etag, last_modified, _ = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
     for attempt in range(max_retries + 1):
-        r = requests.get(url, params=params, timeout=30)
+        r = _SESSION.get(url, params=params, headers=headers, timeout=30)
 
         if r.status_code == 429 and attempt < max_retries:
-            time.sleep(2 ** attempt)
+            retry_after = _retry_after_seconds(r)
+            wait = retry_after if retry_after is not None else 2 ** attempt
+            time.sleep(wait + random.uniform(0, 0.25))
             continue
 
-        r.raise_for_status()
-        return r.json()
+        if r.status_code == 304 and cached is not None:
+            return orjson.loads(cached[2])
+
+        # Explicit status checks: a 404 is an expected outcome in bulk
+        # fetches, not an error worth building an HTTPError for
+        if r.status_code == 404:
+            return None
+        if r.status_code >= 400:
+            r.raise_for_status()
+
+        data = orjson.loads(r.content)
+
+        etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+        if etag or last_modified:
+            _disk_put(disk_key, (etag, last_modified, r.content))
+        return data
 
     raise RuntimeError("TripAdvisor details retry loop ended unexpectedly.")
 
 
+def clear_cache(disk: bool = False) -> None:
+    """
+    Drop the in-process caches of get_city_location() and details().
+
+    With disk=True the on-disk details validator cache is emptied as well.
+    """
+    with _CITY_CACHE_LOCK:
+        _CITY_CACHE.clear()
+    _details_cached.cache_clear()
+
+    if disk:
+        with _DETAILS_DISK_LOCK, shelve.open(_DETAILS_DISK_PATH) as db:
+            db.clear()
+
+
 # -----------------------------
 # Normalization (unified schema)
 # -----------------------------
 
+def _f(x: Any) -> Optional[float]:
+    """TripAdvisor numeric string -> float (None/"" -> None; "0" stays 0.0)."""
+    return float(x) if x is not None and x != "" else None
+
+
+def _i(x: Any) -> Optional[int]:
+    """TripAdvisor numeric string -> int (None/"" -> None; "0" stays 0)."""
+    return int(x) if x is not None and x != "" else None
+
+
 def summarize(place: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize TripAdvisor details response into unified schema."""
     addr = place.get("address_obj") or {}
@@ -127,27 +318,33 @@ def summarize(place: Dict[str, Any]) -> Dict[str, Any]:
     )
 
     cat = place.get("category") or {}
-    groups = [g.get("name") for g in (place.get("groups") or []) if g.get("name")]
-
-    lat = place.get("latitude")
-    lng = place.get("longitude")
+    category = cat.get("name")
+    # Category/group names repeat across many places: intern them so equal
+    # labels share one string object across summaries and DataFrame rows.
+    if isinstance(category, str):
+        category = sys.intern(category)
+    groups = [
+        sys.intern(name) if isinstance(name, str) else name
+        for name in (g.get("name") for g in (place.get("groups") or []))
+        if name
+    ]
 
     return {
         "source": "tripadvisor",
         "item_id": str(place.get("location_id", "")),
         "name": place.get("name"),
         "address": full_address,
-        "rating": float(place["rating"]) if place.get("rating") else None,
-        "review_count": int(place["num_reviews"]) if place.get("num_reviews") else None,
-        "category_primary": cat.get("name"),
+        "rating": _f(place.get("rating")),
+        "review_count": _i(place.get("num_reviews")),
+        "category_primary": category,
         # store TripAdvisor groups in unified schema types
         "types": groups,
         "wheelchair_accessible_entrance": None,
         "opening_hours_weekday_descriptions": None,
         "website": place.get("web_url"),
         "phone": None,
-        "lat": float(lat) if lat is not None else None,
-        "lng": float(lng) if lng is not None else None,
+        "lat": _f(place.get("latitude")),
+        "lng": _f(place.get("longitude")),
     }
 
 
@@ -155,8 +352,42 @@ def summarize(place: Dict[str, Any]) -> Dict[str, Any]:
 # Group filtering helpers
 # -----------------------------
 
-def _norm_set(values: List[str]) -> set[str]:
-    return {v.strip().lower() for v in values if isinstance(v, str) and v.strip()}
+def _norm_set(values: List[str]) -> frozenset[str]:
+    return frozenset(v.strip().lower() for v in values if isinstance(v, str) and v.strip())
+
+
+def _norm_groups(groups: Optional[List[str]]) -> Optional[frozenset[str]]:
+    """Normalize an allow/deny list once; None means "no filter"."""
+    return _norm_set(groups) if groups else None
+
+
+def summary_matches_groups_fast(
+    summary: Dict[str, Any],
+    allow_fs: Optional[frozenset[str]] = None,
+    deny_fs: Optional[frozenset[str]] = None,
+) -> bool:
+    """
+    summary_matches_groups() with pre-normalized allow/deny sets.
+
+    Batch callers normalize the lists once (see _norm_groups) instead of
+    once per candidate.
+    """
+    return _groups_match(_norm_set(summary.get("types") or []), allow_fs, deny_fs)
+
+
+def _groups_match(
+    place_groups: frozenset[str],
+    allow_fs: Optional[frozenset[str]],
+    deny_fs: Optional[frozenset[str]],
+) -> bool:
+    """Allow/deny check on already-normalized groups; isdisjoint() short-circuits and allocates nothing."""
+    if deny_fs is not None and not deny_fs.isdisjoint(place_groups):
+        return False
+
+    if allow_fs is not None:
+        return not allow_fs.isdisjoint(place_groups)
+
+    return True
 
 
 def summary_matches_groups(
@@ -170,18 +401,11 @@ def summary_matches_groups(
     - deny_groups: if any match -> reject
     - allow_groups: if provided, require at least one match
     """
-    place_groups = _norm_set(summary.get("types") or [])
-
-    if deny_groups:
-        deny = _norm_set(deny_groups)
-        if place_groups.intersection(deny):
-            return False
-
-    if allow_groups:
-        allow = _norm_set(allow_groups)
-        return len(place_groups.intersection(allow)) > 0
-
-    return True
+    return summary_matches_groups_fast(
+        summary,
+        allow_fs=_norm_groups(allow_groups),
+        deny_fs=_norm_groups(deny_groups),
+    )
 
 
 def details_summarized_filtered(
@@ -190,9 +414,64 @@ def details_summarized_filtered(
     allow_groups: Optional[List[str]] = None,
     deny_groups: Optional[List[str]] = None,
 ) -> Optional[Dict[str, Any]]:
-    """details() -> summarize() -> filter by groups. Returns summary or None."""
+    """details() -> summarize() -> filter by groups. Returns summary or None (rejected or 404)."""
+    return _details_summarized_filtered_fs(
+        location_id,
+        language,
+        _norm_groups(allow_groups),
+        _norm_groups(deny_groups),
+    )
+
+
+def _details_summarized_filtered_fs(
+    location_id: str,
+    language: str,
+    allow_fs: Optional[frozenset[str]],
+    deny_fs: Optional[frozenset[str]],
+) -> Optional[Dict[str, Any]]:
+    """details_summarized_filtered() with pre-normalized allow/deny sets."""
     d = details(location_id, language=language)
-    s = summarize(d)
-    if not summary_matches_groups(s, allow_groups=allow_groups, deny_groups=deny_groups):
+    if d is None:
         return None
-    return s
\ No newline at end of file
+    s = summarize(d)
+    # Groups are normalized once per item and only for the filter; the
+    # summary itself keeps the plain 'types' list
+    place_groups = _norm_set(s["types"])
+    return s if _groups_match(place_groups, allow_fs, deny_fs) else None
+
+
+def details_many(
+    location_ids: List[str],
+    language: str = "en",
+    max_workers: int = DETAILS_MAX_WORKERS,
+    allow_groups: Optional[List[str]] = None,
+    deny_groups: Optional[List[str]] = None,
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Batch details_summarized_filtered() over a thread pool.
+
+    Notes:
+    - The calls are network-bound, so threads overlap the round trips;
+      all of them share the pooled _SESSION. `max_workers` is capped at the
+      session's connection pool size (_POOL_MAXSIZE).
+    - Output order matches `location_ids`; rejected or unknown (404) items are None.
+    - Duplicate ids are fetched once and repeated in the output.
+    """
+    if not location_ids:
+        return []
+
+    # Normalize the group filters once for the whole batch
+    allow_fs = _norm_groups(allow_groups)
+    deny_fs = _norm_groups(deny_groups)
+
+    def fetch(lid: str) -> Optional[Dict[str, Any]]:
+        return _details_summarized_filtered_fs(lid, language, allow_fs, deny_fs)
+
+    # Duplicate ids (e.g. repeated search hits) are fetched only once
+    unique_ids = list(dict.fromkeys(str(lid) for lid in location_ids))
+
+    workers = min(max_workers, _POOL_MAXSIZE, len(unique_ids))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        by_id = dict(zip(unique_ids, executor.map(fetch, unique_ids)))
+
+    return [by_id[str(lid)] for lid in location_ids]
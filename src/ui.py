@@ -20,15 +20,18 @@ Dependencies:
 Notes:
     This module should NOT contain API/DB logic. It should only orchestrate
     user inputs and display outputs.
+    pandas / ipywidgets / IPython are imported inside the functions that use
+    them, so headless code importing this module does not pay their import cost.
 """
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Optional
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
 
-import pandas as pd
-import ipywidgets as widgets
-from IPython.display import display, clear_output
 
 def format_type_label(label: str) -> str:
     """
@@ -41,46 +44,69 @@ def format_type_label(label: str) -> str:
     """
     if not isinstance(label, str):
         return label
+    return _format_type_label_cached(label)
+
+
+@lru_cache(maxsize=512)
+def _format_type_label_cached(label: str) -> str:
+    """Cached worker behind format_type_label(); the label set is small and bounded."""
     return label.replace("_", " ").title()
 
+
+# Columns shown in the results table (in display order)
+PREFERRED_COLS = [
+    "source",
+    "name",
+    "rating",
+    "review_count",
+    "category_primary",
+    "address",
+    "website",
+    "phone",
+]
+
+# Fixed dtypes for the numeric display columns
+_NUMERIC_DTYPES = {"rating": "float64", "review_count": "Int64"}
+
+
 def results_to_dataframe(results: List[Dict[str, Any]]) -> pd.DataFrame:
-    df = pd.DataFrame(results)
-
-    # --- TripAdvisor: move types (groups) into category_primary for display ---
-    if "source" in df.columns:
-        is_ta = df["source"] == "tripadvisor"
-
-        if "types" in df.columns:
-            # If category_primary is missing/boring (often "Attraction"), show groups instead
-            def ta_primary_from_types(v):
-                if not isinstance(v, list):
-                    return None
-                # choose ONE:
-                # return v[0] if v else None              # first group only
-                return ", ".join(v) if v else None       # all groups joined
-
-            # Overwrite category_primary for TripAdvisor rows using types
-            if "category_primary" in df.columns:
-                df.loc[is_ta, "category_primary"] = df.loc[is_ta, "types"].apply(ta_primary_from_types)
+    import pandas as pd
+
+    present = set()
+    for r in results:
+        present.update(r)
+
+    has_ta_types = "source" in present and "types" in present
+    if has_ta_types:
+        present.add("category_primary")
+
+    cols = [c for c in PREFERRED_COLS if c in present]
+    if not cols:
+        return pd.DataFrame(results)
+
+    # Project to the displayed columns before building the frame, so pandas
+    # never allocates or infers dtypes for fields that are dropped anyway.
+    projected = []
+    for r in results:
+        row = {c: r.get(c) for c in cols}
+
+        # --- TripAdvisor: move types (groups) into category_primary for display ---
+        # (category_primary is often just "Attraction", the groups say more)
+        if has_ta_types and r.get("source") == "tripadvisor":
+            v = r.get("types")
+            if not isinstance(v, list) or not v:
+                row["category_primary"] = None
+            elif len(v) == 1:
+                row["category_primary"] = v[0]  # common case: no join needed
             else:
-                df["category_primary"] = None
-                df.loc[is_ta, "category_primary"] = df.loc[is_ta, "types"].apply(ta_primary_from_types)
-
-            # Make 'types' visually empty for TripAdvisor rows (presentation only)
-            df.loc[is_ta, "types"] = ""
-
-    preferred_cols = [
-        "source",
-        "name",
-        "rating",
-        "review_count",
-        "category_primary",
-        "address",
-        "website",
-        "phone"    
-    ]
-    cols = [c for c in preferred_cols if c in df.columns]
-    return df[cols] if cols else df
+                row["category_primary"] = ", ".join(v)
+
+        projected.append(row)
+
+    # review_count stays integral when some rows have no count
+    # (nullable Int64 instead of float64 with NaN)
+    dtypes = {c: t for c, t in _NUMERIC_DTYPES.items() if c in cols}
+    return pd.DataFrame(projected, columns=cols).astype(dtypes)
 
 
 def print_opening_hours(summary: Dict[str, Any]) -> None:
@@ -93,10 +119,6 @@ def print_opening_hours(summary: Dict[str, Any]) -> None:
         print(line)
 
 
-from typing import Any, Callable, Dict, List, Optional
-import ipywidgets as widgets
-from IPython.display import display
-
 def build_city_widget(
     search_fn: Callable[[str], List[Dict[str, Any]]],
     *,
@@ -111,6 +133,9 @@ def build_city_widget(
     - Stores last searched city in returned state dict and in build_city_widget.last_city
     - If selenium_fn is provided, runs it right after search using the same city
     """
+    import ipywidgets as widgets
+    from IPython.display import display
+
     if title:
         display(widgets.HTML(f"<b>{title}</b>"))
 